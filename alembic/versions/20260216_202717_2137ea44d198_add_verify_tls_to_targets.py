@@ -23,13 +23,12 @@ depends_on: str | Sequence[str] | None = None
 
 def upgrade() -> None:
     """Add verify_tls column to targets."""
-    # Add verify_tls column with default True for existing rows
+    # NOT NULL DEFAULT is a catalog-only change on Postgres 11+; keeping the
+    # server default avoids a second DDL (and AccessExclusiveLock) to drop it.
     op.add_column(
         "targets",
         sa.Column("verify_tls", sa.Boolean(), nullable=False, server_default="true"),
     )
-    # Remove server_default after column is populated
-    op.alter_column("targets", "verify_tls", server_default=None)
 
 
 def downgrade() -> None:
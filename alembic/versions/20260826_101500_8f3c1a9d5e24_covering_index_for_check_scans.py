@@ -0,0 +1,42 @@
+"""Replace the checks composite index with a covering index.
+
+Revision ID: 8f3c1a9d5e24
+Revises: 2137ea44d198
+Create Date: 2026-08-26 10:15:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3c1a9d5e24"
+down_revision: str | None = "2137ea44d198"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Swap the plain composite index for a descending covering index."""
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block
+    # and raw SQL (create_index has no INCLUDE support on older Alembic).
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_checks_target_id_checked_at_covering "
+            "ON checks (target_id, checked_at DESC) "
+            "INCLUDE (up, latency_ms, http_status, error_type, error_message)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_checks_target_id_checked_at")
+
+
+def downgrade() -> None:
+    """Restore the plain ascending composite index."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_checks_target_id_checked_at "
+            "ON checks (target_id, checked_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_checks_target_id_checked_at_covering")
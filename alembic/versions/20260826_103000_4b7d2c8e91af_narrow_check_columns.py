@@ -0,0 +1,47 @@
+"""Narrow check columns to a native enum, text and smallint.
+
+Revision ID: 4b7d2c8e91af
+Revises: 8f3c1a9d5e24
+Create Date: 2026-08-26 10:30:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7d2c8e91af"
+down_revision: str | None = "8f3c1a9d5e24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Store error_type as a native enum, error_message as text, http_status as smallint."""
+    # Native enums compare as 4-byte ints instead of varchar; smallint saves
+    # 2 bytes per row. Narrower rows pack more checks per 8KB page.
+    op.execute(
+        "CREATE TYPE error_type_t AS ENUM ('dns', 'connect', 'tls', 'timeout', 'http', 'unknown')"
+    )
+    op.execute(
+        "ALTER TABLE checks ALTER COLUMN error_type TYPE error_type_t "
+        "USING error_type::error_type_t"
+    )
+    op.execute("ALTER TABLE checks ALTER COLUMN error_message TYPE text")
+    op.execute(
+        "ALTER TABLE checks ADD CONSTRAINT ck_checks_error_message_len "
+        "CHECK (length(error_message) <= 500)"
+    )
+    op.execute("ALTER TABLE checks ALTER COLUMN http_status TYPE smallint")
+
+
+def downgrade() -> None:
+    """Restore the varchar and integer column types."""
+    op.execute("ALTER TABLE checks ALTER COLUMN http_status TYPE integer")
+    op.execute("ALTER TABLE checks DROP CONSTRAINT ck_checks_error_message_len")
+    op.execute("ALTER TABLE checks ALTER COLUMN error_message TYPE varchar(500)")
+    op.execute("ALTER TABLE checks ALTER COLUMN error_type TYPE varchar(50) USING error_type::text")
+    op.execute("DROP TYPE error_type_t")
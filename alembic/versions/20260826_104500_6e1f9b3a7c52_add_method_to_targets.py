@@ -0,0 +1,34 @@
+"""Add probe method column to targets.
+
+Revision ID: 6e1f9b3a7c52
+Revises: 4b7d2c8e91af
+Create Date: 2026-08-26 10:45:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1f9b3a7c52"
+down_revision: str | None = "4b7d2c8e91af"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the method column defaulting to GET."""
+    op.add_column(
+        "targets",
+        sa.Column("method", sa.String(length=8), server_default="GET", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Remove the method column."""
+    op.drop_column("targets", "method")
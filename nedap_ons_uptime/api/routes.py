@@ -2,29 +2,52 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Any
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from pydantic import BaseModel, Field, HttpUrl
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
+from sqlalchemy import func, lambda_stmt, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from nedap_ons_uptime.auth import (
     clear_authenticated,
+    get_request_settings,
     is_authenticated,
     mask_url,
     require_authenticated_user,
     set_authenticated,
     verify_credentials,
 )
-from nedap_ons_uptime.config import get_settings
-from nedap_ons_uptime.db.models import Check, Target
+from nedap_ons_uptime.cache import TTLCache
+from nedap_ons_uptime.config import Settings, get_settings
+from nedap_ons_uptime.db.models import Check, Target, utcnow
 from nedap_ons_uptime.db.session import get_session
+from nedap_ons_uptime.monitoring import forget_target
 
 router = APIRouter()
 
+_STATUS_CACHE = TTLCache(ttl_s=5)
+_UPTIME_CACHE = TTLCache(ttl_s=60)
+
+# Bumped on every target mutation so /status ETags change immediately,
+# not only when the next check row advances max(checked_at).
+_status_generation = 0
+
+
+def _invalidate_status_cache() -> None:
+    """Drop cached /status payloads and move its ETag generation forward."""
+    global _status_generation
+    _status_generation += 1
+    _STATUS_CACHE.clear()
+
+
+SettingsDep = Annotated[Settings, Depends(get_request_settings)]
+
 
 class TargetCreate(BaseModel):
     """Payload for creating a monitored target."""
@@ -35,6 +58,7 @@ class TargetCreate(BaseModel):
     interval_s: int = Field(default=60, ge=10, le=3600)
     timeout_s: int = Field(default=10, ge=1, le=30)
     verify_tls: bool = True
+    method: Literal["GET", "HEAD"] = "GET"
 
 
 class TargetUpdate(BaseModel):
@@ -46,6 +70,7 @@ class TargetUpdate(BaseModel):
     interval_s: int | None = Field(None, ge=10, le=3600)
     timeout_s: int | None = Field(None, ge=1, le=30)
     verify_tls: bool | None = None
+    method: Literal["GET", "HEAD"] | None = None
 
 
 class TargetResponse(BaseModel):
@@ -58,6 +83,7 @@ class TargetResponse(BaseModel):
     interval_s: int
     timeout_s: int
     verify_tls: bool
+    method: str
     created_at: datetime
     updated_at: datetime
 
@@ -104,6 +130,24 @@ class UptimeResponse(BaseModel):
     down_checks: int
 
 
+class DashboardRow(BaseModel):
+    """Latest status plus aggregated uptime for a target."""
+
+    target_id: UUID
+    name: str
+    url: str
+    up: bool | None
+    last_checked: datetime | None
+    latency_ms: int | None
+    http_status: int | None
+    error_type: str | None
+    error_message: str | None
+    uptime_percentage: float
+    total_checks: int
+    up_checks: int
+    down_checks: int
+
+
 class ConfigResponse(BaseModel):
     """Public runtime configuration exposed to clients."""
 
@@ -124,6 +168,11 @@ class AuthStateResponse(BaseModel):
     auth_enabled: bool
 
 
+_TARGETS_ADAPTER = TypeAdapter(list[TargetResponse])
+_CHECKS_ADAPTER = TypeAdapter(list[CheckResponse])
+_STATUS_ADAPTER = TypeAdapter(list[StatusResponse])
+
+
 def _serialize_target(target: Target, expose_url: bool) -> TargetResponse:
     return TargetResponse(
         id=target.id,
@@ -133,49 +182,55 @@ def _serialize_target(target: Target, expose_url: bool) -> TargetResponse:
         interval_s=target.interval_s,
         timeout_s=target.timeout_s,
         verify_tls=target.verify_tls,
+        method=target.method,
         created_at=target.created_at,
         updated_at=target.updated_at,
     )
 
 
-def _serialize_status_row(target: Target, check: Check | None, expose_url: bool) -> dict[str, Any]:
-    if check:
-        return {
-            "target_id": str(target.id),
-            "name": target.name,
-            "url": target.url if expose_url else mask_url(target.url),
-            "up": check.up,
-            "last_checked": check.checked_at,
-            "latency_ms": check.latency_ms,
-            "http_status": check.http_status,
-            "error_type": check.error_type,
-            "error_message": check.error_message,
-        }
+def _naive_utc(value: datetime) -> datetime:
+    """Normalize a query datetime to the naive UTC that checked_at stores."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
 
+
+def _serialize_status_row(target: Target, check: Check | None, expose_url: bool) -> dict[str, Any]:
+    url_value = target.url if expose_url else mask_url(target.url)
     return {
-        "target_id": str(target.id),
+        "target_id": target.id,
         "name": target.name,
-        "url": target.url if expose_url else mask_url(target.url),
-        "up": None,
-        "last_checked": None,
-        "latency_ms": None,
-        "http_status": None,
-        "error_type": None,
-        "error_message": None,
+        "url": url_value,
+        "up": check.up if check else None,
+        "last_checked": check.checked_at if check else None,
+        "latency_ms": check.latency_ms if check else None,
+        "http_status": check.http_status if check else None,
+        "error_type": check.error_type if check else None,
+        "error_message": check.error_message if check else None,
     }
 
 
+@lru_cache
+def _config_payload() -> tuple[bytes, str]:
+    settings = get_settings()
+    payload = ConfigResponse(app_timezone=settings.app_timezone).model_dump_json().encode()
+    return payload, f'"{settings.app_timezone}"'
+
+
 @router.get("/config", response_model=ConfigResponse)
-async def get_config() -> ConfigResponse:
+async def get_config() -> Response:
     """Return frontend configuration values."""
-    settings = get_settings()
-    return ConfigResponse(app_timezone=settings.app_timezone)
+    payload, etag = _config_payload()
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600", "ETag": etag},
+    )
 
 
 @router.get("/auth/me", response_model=AuthStateResponse)
-async def auth_me(request: Request) -> AuthStateResponse:
+async def auth_me(request: Request, settings: SettingsDep) -> AuthStateResponse:
     """Return authentication state for the current request."""
-    settings = get_settings()
     return AuthStateResponse(
         authenticated=is_authenticated(request),
         auth_enabled=settings.auth_enabled,
@@ -183,10 +238,10 @@ async def auth_me(request: Request) -> AuthStateResponse:
 
 
 @router.post("/auth/login", response_model=AuthStateResponse)
-async def auth_login(payload: LoginRequest, request: Request) -> AuthStateResponse:
+async def auth_login(
+    payload: LoginRequest, request: Request, settings: SettingsDep
+) -> AuthStateResponse:
     """Authenticate a user session."""
-    settings = get_settings()
-
     if not settings.auth_enabled:
         return AuthStateResponse(authenticated=True, auth_enabled=False)
 
@@ -198,9 +253,8 @@ async def auth_login(payload: LoginRequest, request: Request) -> AuthStateRespon
 
 
 @router.post("/auth/logout", response_model=AuthStateResponse)
-async def auth_logout(request: Request) -> AuthStateResponse:
+async def auth_logout(request: Request, settings: SettingsDep) -> AuthStateResponse:
     """Log out the current user session."""
-    settings = get_settings()
     clear_authenticated(request)
     return AuthStateResponse(authenticated=False, auth_enabled=settings.auth_enabled)
 
@@ -209,11 +263,17 @@ async def auth_logout(request: Request) -> AuthStateResponse:
 async def list_targets(
     request: Request,
     session: AsyncSession = Depends(get_session),
-) -> list[TargetResponse]:
+) -> Response:
     """List all configured targets."""
-    result = await session.execute(select(Target))
-    expose_url = is_authenticated(request)
-    return [_serialize_target(target, expose_url=expose_url) for target in result.scalars().all()]
+    result = await session.stream_scalars(select(Target), execution_options={"yield_per": 200})
+    if is_authenticated(request):
+        targets = _TARGETS_ADAPTER.validate_python(
+            [target async for target in result], from_attributes=True
+        )
+    else:
+        targets = [_serialize_target(target, expose_url=False) async for target in result]
+    # Dump through the adapter and bypass FastAPI's per-request re-validation.
+    return Response(_TARGETS_ADAPTER.dump_json(targets), media_type="application/json")
 
 
 @router.post("/targets", response_model=TargetResponse, status_code=201)
@@ -223,22 +283,23 @@ async def create_target(
     _: None = Depends(require_authenticated_user),
 ) -> Target:
     """Create a new monitored target."""
-    target = Target(**target_data.model_dump(mode="json"))
+    data = target_data.model_dump()
+    data["url"] = str(data["url"])
+    target = Target(**data)
     session.add(target)
     await session.flush()
-    await session.refresh(target)
+    _invalidate_status_cache()
     return target
 
 
 @router.get("/targets/{target_id}", response_model=TargetResponse)
 async def get_target(
-    target_id: str,
+    target_id: UUID,
     request: Request,
     session: AsyncSession = Depends(get_session),
 ) -> TargetResponse:
     """Fetch a target by ID."""
-    result = await session.execute(select(Target).where(Target.id == target_id))
-    target = result.scalar_one_or_none()
+    target = await session.get(Target, target_id)
     if target is None:
         raise HTTPException(status_code=404, detail="Target not found")
     return _serialize_target(target, expose_url=is_authenticated(request))
@@ -246,148 +307,303 @@ async def get_target(
 
 @router.patch("/targets/{target_id}", response_model=TargetResponse)
 async def update_target(
-    target_id: str,
+    target_id: UUID,
     target_update: TargetUpdate,
     session: AsyncSession = Depends(get_session),
     _: None = Depends(require_authenticated_user),
 ) -> Target:
     """Update an existing target by ID."""
-    result = await session.execute(select(Target).where(Target.id == target_id))
-    target = result.scalar_one_or_none()
+    target = await session.get(Target, target_id)
     if target is None:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    update_data = target_update.model_dump(exclude_unset=True, mode="json")
+    update_data = target_update.model_dump(exclude_unset=True)
+    if "url" in update_data:
+        update_data["url"] = str(update_data["url"])
     for field, value in update_data.items():
         setattr(target, field, value)
 
     await session.flush()
-    await session.refresh(target)
+    _invalidate_status_cache()
+    _UPTIME_CACHE.clear()
     return target
 
 
 @router.delete("/targets/{target_id}", status_code=204)
 async def delete_target(
-    target_id: str,
+    target_id: UUID,
     session: AsyncSession = Depends(get_session),
     _: None = Depends(require_authenticated_user),
 ) -> None:
     """Delete a target by ID."""
-    result = await session.execute(select(Target).where(Target.id == target_id))
-    target = result.scalar_one_or_none()
+    target = await session.get(Target, target_id)
     if target is None:
         raise HTTPException(status_code=404, detail="Target not found")
     await session.delete(target)
+    forget_target(target_id)
+    _invalidate_status_cache()
+    _UPTIME_CACHE.clear()
 
 
 @router.get("/status", response_model=list[StatusResponse])
 async def get_status(
     request: Request,
     session: AsyncSession = Depends(get_session),
-) -> list[dict[str, Any]]:
+) -> Response:
     """Return latest status information for all targets."""
-    subq = (
-        select(Check.target_id, func.max(Check.checked_at).label("last_checked"))
-        .group_by(Check.target_id)
-        .subquery()
-    )
+    expose_url = is_authenticated(request)
 
-    latest_checks = select(Check).join(
-        subq, (Check.target_id == subq.c.target_id) & (Check.checked_at == subq.c.last_checked)
-    )
+    # Checks advance max(checked_at) every cycle, so it doubles as a cheap
+    # change marker; polling clients get 304s instead of full payloads.
+    latest = await session.scalar(select(func.max(Check.checked_at)))
+    marker = latest.isoformat() if latest else "empty"
+    etag = f'"{expose_url}-{_status_generation}-{marker}"'
+    # The payload varies by session (URL masking), so keep it out of
+    # shared caches and make revalidation cookie-aware.
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=5, stale-while-revalidate=30",
+        "Vary": "Cookie",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    payload = _STATUS_CACHE.get(expose_url)
+    if payload is None:
+        result = await session.execute(
+            select(Target, Check)
+            .join(Check, Check.target_id == Target.id, isouter=True)
+            .order_by(Target.id, Check.checked_at.desc(), Check.id)
+            .distinct(Target.id)
+        )
 
-    result = await session.execute(latest_checks)
-    checks = {c.target_id: c for c in result.scalars().all()}
+        rows = _STATUS_ADAPTER.validate_python(
+            [
+                _serialize_status_row(target, check, expose_url=expose_url)
+                for target, check in result.all()
+            ]
+        )
+        # Cache the serialized bytes: cache hits skip validation and dumping.
+        payload = _STATUS_ADAPTER.dump_json(rows)
+        _STATUS_CACHE.set(expose_url, payload)
+    return Response(payload, media_type="application/json", headers=headers)
+
+
+@router.get("/dashboard", response_model=list[DashboardRow])
+async def get_dashboard(
+    request: Request,
+    days: int = Query(default=30, ge=1, le=365),
+    session: AsyncSession = Depends(get_session),
+) -> list[dict[str, Any]]:
+    """Return latest status and uptime stats for all targets in one call."""
+    cutoff = utcnow() - timedelta(days=days)
+
+    latest = (
+        select(Check)
+        .where(Check.target_id == Target.id)
+        .order_by(Check.checked_at.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    stats = (
+        select(
+            func.count(Check.id).label("total_checks"),
+            func.count().filter(Check.up.is_(True)).label("up_checks"),
+        )
+        .where(Check.target_id == Target.id)
+        .where(Check.checked_at >= cutoff)
+        .lateral("stats")
+    )
 
-    result = await session.execute(select(Target))
-    targets = result.scalars().all()
+    result = await session.execute(
+        select(
+            Target,
+            latest.c.up,
+            latest.c.checked_at,
+            latest.c.latency_ms,
+            latest.c.http_status,
+            latest.c.error_type,
+            latest.c.error_message,
+            stats.c.total_checks,
+            stats.c.up_checks,
+        )
+        .select_from(Target)
+        .outerjoin(latest, true())
+        .outerjoin(stats, true())
+    )
 
-    status = []
     expose_url = is_authenticated(request)
-    for target in targets:
-        check = checks.get(target.id)
-        status.append(_serialize_status_row(target, check, expose_url=expose_url))
+    rows = []
+    for (
+        target,
+        up,
+        checked_at,
+        latency_ms,
+        http_status,
+        error_type,
+        error_message,
+        *counts,
+    ) in result.all():
+        total_checks = int(counts[0] or 0)
+        up_checks = int(counts[1] or 0)
+        rows.append(
+            {
+                "target_id": target.id,
+                "name": target.name,
+                "url": target.url if expose_url else mask_url(target.url),
+                "up": up,
+                "last_checked": checked_at,
+                "latency_ms": latency_ms,
+                "http_status": http_status,
+                "error_type": error_type,
+                "error_message": error_message,
+                "uptime_percentage": (up_checks / total_checks * 100) if total_checks else 0,
+                "total_checks": total_checks,
+                "up_checks": up_checks,
+                "down_checks": total_checks - up_checks,
+            }
+        )
 
-    return status
+    return rows
 
 
 @router.get("/targets/{target_id}/history", response_model=list[CheckResponse])
 async def get_target_history(
-    target_id: str,
+    target_id: UUID,
     hours: int = Query(default=24, ge=1, le=720),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    before: datetime | None = Query(default=None),
     session: AsyncSession = Depends(get_session),
-) -> list[Check]:
+) -> Response:
     """Return historical checks for a specific target."""
-    result = await session.execute(select(Target).where(Target.id == target_id))
-    target = result.scalar_one_or_none()
+    target = await session.get(Target, target_id)
     if target is None:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    cutoff = datetime.utcnow() - timedelta(hours=hours)
-    result = await session.execute(
-        select(Check)
+    if before is not None:
+        before = _naive_utc(before)
+    cutoff = utcnow() - timedelta(hours=hours)
+    query = (
+        select(
+            Check.id,
+            Check.target_id,
+            Check.checked_at,
+            Check.up,
+            Check.latency_ms,
+            Check.http_status,
+            Check.error_type,
+            Check.error_message,
+        )
         .where(Check.target_id == target_id)
         .where(Check.checked_at >= cutoff)
-        .order_by(Check.checked_at.desc())
     )
-    return list(result.scalars().all())
+    # Keyset pagination: pass the oldest checked_at of the previous page.
+    if before is not None:
+        query = query.where(Check.checked_at < before)
+
+    result = await session.execute(query.order_by(Check.checked_at.desc()).limit(limit))
+    checks = [CheckResponse.model_construct(**row._mapping) for row in result]
+    return Response(_CHECKS_ADAPTER.dump_json(checks), media_type="application/json")
 
 
 @router.get("/history", response_model=list[CheckResponse])
 async def get_all_history(
     hours: int = Query(default=24, ge=1, le=720),
-    target_id: str | None = Query(default=None),
+    target_id: UUID | None = Query(default=None),
     up: bool | None = Query(default=None),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    before: datetime | None = Query(default=None),
+    ndjson: bool = Query(default=False),
     session: AsyncSession = Depends(get_session),
-) -> list[Check]:
+) -> Response:
     """Get check history across all targets with optional filters."""
-    cutoff = datetime.utcnow() - timedelta(hours=hours)
-
-    query = select(Check).where(Check.checked_at >= cutoff)
+    if before is not None:
+        before = _naive_utc(before)
+    cutoff = utcnow() - timedelta(hours=hours)
+
+    # lambda_stmt caches the compiled SQL per combination of filters.
+    query = lambda_stmt(
+        lambda: select(
+            Check.id,
+            Check.target_id,
+            Check.checked_at,
+            Check.up,
+            Check.latency_ms,
+            Check.http_status,
+            Check.error_type,
+            Check.error_message,
+        ).where(Check.checked_at >= cutoff)
+    )
 
     if target_id:
-        query = query.where(Check.target_id == target_id)
+        query += lambda s: s.where(Check.target_id == target_id)
     if up is not None:
-        query = query.where(Check.up == up)
+        query += lambda s: s.where(Check.up == up)
+    if before is not None:
+        query += lambda s: s.where(Check.checked_at < before)
+
+    query += lambda s: s.order_by(Check.checked_at.desc()).limit(limit)
+
+    if ndjson:
+        # Stream row batches so peak memory stays O(batch) for wide windows.
+        stream = await session.stream(query, execution_options={"yield_per": 1000})
+
+        async def rows() -> AsyncGenerator[bytes, None]:
+            async for row in stream:
+                check = CheckResponse.model_construct(**row._mapping)
+                yield check.model_dump_json().encode() + b"\n"
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
 
-    query = query.order_by(Check.checked_at.desc())
     result = await session.execute(query)
-    return list(result.scalars().all())
+    checks = [CheckResponse.model_construct(**row._mapping) for row in result]
+    return Response(_CHECKS_ADAPTER.dump_json(checks), media_type="application/json")
 
 
 @router.get("/targets/{target_id}/uptime", response_model=UptimeResponse)
 async def get_target_uptime(
-    target_id: str,
+    target_id: UUID,
     days: int = Query(default=30, ge=1, le=365),
     session: AsyncSession = Depends(get_session),
 ) -> dict[str, Any]:
     """Return aggregated uptime stats for a target."""
-    result = await session.execute(select(Target).where(Target.id == target_id))
-    target = result.scalar_one_or_none()
-    if target is None:
-        raise HTTPException(status_code=404, detail="Target not found")
+    cached = _UPTIME_CACHE.get((target_id, days))
+    if cached is not None:
+        return cached
 
-    cutoff = datetime.utcnow() - timedelta(days=days)
+    cutoff = utcnow() - timedelta(days=days)
     result = await session.execute(
-        select(func.count(Check.id), func.sum(Check.up.cast("integer")))
-        .where(Check.target_id == target_id)
-        .where(Check.checked_at >= cutoff)
+        select(
+            Target.id,
+            Target.name,
+            func.count(Check.id),
+            func.count().filter(Check.up.is_(True)),
+        )
+        .select_from(Target)
+        .outerjoin(Check, (Check.target_id == Target.id) & (Check.checked_at >= cutoff))
+        .where(Target.id == target_id)
+        .group_by(Target.id, Target.name)
     )
-    total, up_sum = result.first()
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Target not found")
 
+    found_id, name, total, up_count = row
     total_checks = int(total) if total else 0
-    up_checks = int(up_sum) if up_sum else 0
+    up_checks = int(up_count) if up_count else 0
     down_checks = total_checks - up_checks
     uptime_percentage = (up_checks / total_checks * 100) if total_checks > 0 else 0
 
-    return {
-        "target_id": str(target.id),
-        "name": target.name,
+    uptime = {
+        "target_id": found_id,
+        "name": name,
         "uptime_percentage": uptime_percentage,
         "total_checks": total_checks,
         "up_checks": up_checks,
         "down_checks": down_checks,
     }
+    _UPTIME_CACHE.set((target_id, days), uptime)
+    return uptime
 
 
 class DailyUptimeResponse(BaseModel):
@@ -402,42 +618,39 @@ class DailyUptimeResponse(BaseModel):
 
 @router.get("/targets/{target_id}/daily", response_model=list[DailyUptimeResponse])
 async def get_target_daily_uptime(
-    target_id: str,
+    target_id: UUID,
     days: int = Query(default=30, ge=1, le=90),
     session: AsyncSession = Depends(get_session),
 ) -> list[dict[str, Any]]:
     """Return daily uptime breakdown for the last N days."""
-    result = await session.execute(select(Target).where(Target.id == target_id))
-    target = result.scalar_one_or_none()
+    target = await session.get(Target, target_id)
     if target is None:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    cutoff = datetime.utcnow() - timedelta(days=days)
+    now = utcnow()
+    cutoff = now - timedelta(days=days)
 
-    # Get all checks in the date range
+    # Aggregate per day in the database: at most `days` rows come back
     result = await session.execute(
-        select(Check)
+        select(
+            func.date_trunc("day", Check.checked_at).label("day"),
+            func.count(Check.id),
+            func.count().filter(Check.up.is_(True)),
+        )
         .where(Check.target_id == target_id)
         .where(Check.checked_at >= cutoff)
-        .order_by(Check.checked_at.asc())
+        .group_by("day")
     )
-    checks = result.scalars().all()
-
-    # Group by day
-    daily_data: dict[str, dict] = {}
-    for check in checks:
-        day_key = check.checked_at.strftime("%Y-%m-%d")
-        if day_key not in daily_data:
-            daily_data[day_key] = {"total": 0, "up": 0}
-        daily_data[day_key]["total"] += 1
-        if check.up:
-            daily_data[day_key]["up"] += 1
+
+    daily_data: dict[str, dict] = {
+        day.strftime("%Y-%m-%d"): {"total": int(total), "up": int(up_count or 0)}
+        for day, total, up_count in result.all()
+    }
 
     # Build response with all days (fill in missing days with 100% uptime)
     response = []
     for i in range(days - 1, -1, -1):
-        day = datetime.utcnow() - timedelta(days=i)
-        day_key = day.strftime("%Y-%m-%d")
+        day_key = (now - timedelta(days=i)).strftime("%Y-%m-%d")
         day_data = daily_data.get(day_key, {"total": 0, "up": 0})
 
         total = day_data["total"]
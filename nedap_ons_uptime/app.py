@@ -3,11 +3,11 @@
 import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager, suppress
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
@@ -22,7 +22,12 @@ STATIC_DIR = Path(__file__).parent / "static"
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Initialize and tear down shared app resources."""
     settings = get_settings()
-    db = Database(settings.database_url)
+    db = Database(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle_s=settings.db_pool_recycle_s,
+    )
     set_database(db)
 
     await db.init()
@@ -50,16 +55,27 @@ async def worker_task(concurrency: int) -> None:
 
 async def retention_task_loop(retention_days: int) -> None:
     """Periodically delete old checks according to retention policy."""
-    from sqlalchemy import delete
+    from sqlalchemy import delete, select
 
-    from .db.models import Check
+    from .db.models import Check, utcnow
     from .db.session import get_database as get_db
 
+    batch_size = 5000
+
     async def cleanup_old_checks() -> None:
         db = get_db()
-        async with db.session() as session:
-            cutoff = datetime.utcnow() - timedelta(days=retention_days)
-            await session.execute(delete(Check).where(Check.checked_at < cutoff))
+        cutoff = utcnow() - timedelta(days=retention_days)
+        while True:
+            # Delete in bounded batches so one huge transaction never holds
+            # a long write lock or starves the check-writer on this loop.
+            doomed = (
+                select(Check.id).where(Check.checked_at < cutoff).limit(batch_size)
+            ).scalar_subquery()
+            async with db.session() as session:
+                result = await session.execute(delete(Check).where(Check.id.in_(doomed)))
+            if result.rowcount < batch_size:
+                break
+            await asyncio.sleep(0.05)
 
     while True:
         await cleanup_old_checks()
@@ -68,8 +84,11 @@ async def retention_task_loop(retention_days: int) -> None:
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
-    app = FastAPI(title="Nedap ONS Uptime", lifespan=lifespan)
+    app = FastAPI(
+        title="Nedap ONS Uptime", lifespan=lifespan, default_response_class=ORJSONResponse
+    )
     settings = get_settings()
+    app.state.settings = settings
 
     app.add_middleware(
         SessionMiddleware,
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import hmac
-from urllib.parse import urlsplit, urlunsplit
+import re
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException, Request, status
 
 from nedap_ons_uptime.config import Settings, get_settings
 
 AUTH_SESSION_KEY = "authenticated"
+_URL_RE = re.compile(r"^(?P<scheme>[a-zA-Z][a-zA-Z0-9+.\-]*)://(?P<host>[^/?#]+)")
 
 
 def is_auth_enabled(settings: Settings | None = None) -> bool:
@@ -18,9 +20,16 @@ def is_auth_enabled(settings: Settings | None = None) -> bool:
     return app_settings.auth_enabled
 
 
+def get_request_settings(request: Request) -> Settings:
+    """Return settings bound to the app at startup, or the cached globals."""
+    app = request.scope.get("app")
+    settings = getattr(app.state, "settings", None) if app is not None else None
+    return settings if settings is not None else get_settings()
+
+
 def is_authenticated(request: Request) -> bool:
     """Return whether the current request is authenticated."""
-    if not is_auth_enabled():
+    if not get_request_settings(request).auth_enabled:
         return True
     return bool(request.session.get(AUTH_SESSION_KEY, False))
 
@@ -49,7 +58,7 @@ def clear_authenticated(request: Request) -> None:
 
 def require_authenticated_user(
     request: Request,
-    settings: Settings = Depends(get_settings),
+    settings: Settings = Depends(get_request_settings),
 ) -> None:
     """Enforce authentication when auth is enabled."""
     if not settings.auth_enabled:
@@ -61,14 +70,13 @@ def require_authenticated_user(
         )
 
 
+@lru_cache(maxsize=1024)
 def mask_url(url: str) -> str:
     """Mask URL host and path for unauthenticated responses."""
-    parsed = urlsplit(url)
-    host = parsed.netloc
-
-    if not host:
+    match = _URL_RE.match(url)
+    if match is None:
         return "***"
 
+    host = match["host"]
     masked_host = host[0] + "***" if len(host) > 1 else "*"
-    masked = parsed._replace(netloc=masked_host, path="/***", query="", fragment="")
-    return urlunsplit(masked)
+    return f"{match['scheme']}://{masked_host}/***"
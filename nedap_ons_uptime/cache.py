@@ -0,0 +1,38 @@
+"""In-process TTL caching for hot read endpoints."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Expiring key/value store backed by a plain dict."""
+
+    def __init__(self, ttl_s: float) -> None:
+        """Create a cache whose entries expire after ttl_s seconds."""
+        self.ttl_s = ttl_s
+        self._entries: dict[Hashable, tuple[float, V]] = {}
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the cached value for key, or None when absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store value under key with a fresh expiry."""
+        self._entries[key] = (time.monotonic() + self.ttl_s, value)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
@@ -1,6 +1,7 @@
 """CLI entrypoints for running and maintaining the uptime service."""
 
 import asyncio
+from pathlib import Path
 
 import typer
 from uvicorn import Config, Server
@@ -11,25 +12,35 @@ from nedap_ons_uptime.config import get_settings
 app = typer.Typer(help="Nedap ONS Uptime Dashboard")
 
 
+def run_migrations(database_url: str) -> None:
+    """Apply Alembic migrations in-process up to head."""
+    import os
+
+    from alembic.config import Config as AlembicConfig
+
+    from alembic import command
+
+    repo_root = Path(__file__).resolve().parent.parent
+    os.environ["DATABASE_URL"] = database_url
+    alembic_config = AlembicConfig(str(repo_root / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(repo_root / "alembic"))
+    command.upgrade(alembic_config, "head")
+
+
 @app.command()
 def serve() -> None:
     """Run migrations, start FastAPI server and background worker."""
-    import os
-    import subprocess
-    import sys
     import time
 
     settings = get_settings()
 
     for attempt in range(1, 11):
-        result = subprocess.run(
-            [sys.executable, "-m", "alembic", "upgrade", "head"],
-            env={**os.environ, "DATABASE_URL": settings.database_url},
-        )
-        if result.returncode == 0:
+        try:
+            run_migrations(settings.database_url)
             break
-        typer.echo(f"Migration attempt {attempt}/10 failed, retrying in 3s...", err=True)
-        time.sleep(3)
+        except Exception:
+            typer.echo(f"Migration attempt {attempt}/10 failed, retrying in 3s...", err=True)
+            time.sleep(3)
     else:
         typer.echo("Migration failed after 10 attempts", err=True)
         raise typer.Exit(1)
@@ -46,19 +57,13 @@ def serve() -> None:
 @app.command()
 def migrate() -> None:
     """Run Alembic migrations."""
-    import os
-    import subprocess
-    import sys
-
     settings = get_settings()
 
-    result = subprocess.run(
-        [sys.executable, "-m", "alembic", "upgrade", "head"],
-        env={**os.environ, "DATABASE_URL": settings.database_url},
-    )
-    if result.returncode != 0:
+    try:
+        run_migrations(settings.database_url)
+    except Exception:
         typer.echo("Migration failed", err=True)
-        raise typer.Exit(1)
+        raise typer.Exit(1) from None
 
     typer.echo("Migrations completed successfully")
 
@@ -70,10 +75,15 @@ def check_once() -> None:
 
     from .config import get_settings
     from .db.session import Database, set_database
-    from .monitoring import run_checks
+    from .monitoring import close_probe_clients, run_checks
 
     settings = get_settings()
-    db = Database(settings.database_url)
+    db = Database(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle_s=settings.db_pool_recycle_s,
+    )
     set_database(db)
 
     async def run() -> None:
@@ -81,6 +91,7 @@ def check_once() -> None:
         try:
             await run_checks(settings.concurrency)
         finally:
+            await close_probe_clients()
             await db.close()
 
     asyncio.run(run())
@@ -16,6 +16,9 @@ class Settings(BaseSettings):
     app_port: int = 8000
     concurrency: int = 20
     retention_days: int = 35
+    db_pool_size: int = 20
+    db_max_overflow: int = 20
+    db_pool_recycle_s: int = 300
     app_timezone: str = "Europe/Amsterdam"
     auth_enabled: bool = Field(default=True, validation_alias="AUTH_ENABLED")
     auth_username: str = Field(default="admin", validation_alias="AUTH_USERNAME")
@@ -2,15 +2,53 @@
 
 from __future__ import annotations
 
+import secrets
+import time
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    desc,
+    true,
+)
+from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def utcnow() -> datetime:
+    """Return the current naive UTC timestamp."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def uuid7() -> uuid.UUID:
+    """Return a time-ordered UUIDv7 (RFC 9562).
+
+    Time-ordered keys append to the rightmost B-tree page, avoiding the
+    page splits random v4 keys cause at check-insert volume. These ids
+    are sortable by creation time and must not be treated as unguessable.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (
+        ((timestamp_ms & 0xFFFFFFFFFFFF) << 80)
+        | (0x7 << 76)
+        | (secrets.randbits(12) << 64)
+        | (0b10 << 62)
+        | secrets.randbits(62)
+    )
+    return uuid.UUID(int=value)
+
+
 class Base(DeclarativeBase):
     """Declarative base for ORM models."""
 
@@ -41,14 +79,17 @@ class Target(Base):
     enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     interval_s: Mapped[int] = mapped_column(Integer, default=60, nullable=False)
     timeout_s: Mapped[int] = mapped_column(Integer, default=10, nullable=False)
-    verify_tls: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.utcnow(), nullable=False
+    verify_tls: Mapped[bool] = mapped_column(
+        Boolean, default=True, server_default=true(), nullable=False
     )
+    method: Mapped[str] = mapped_column(
+        String(8), default="GET", server_default="GET", nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=lambda: datetime.utcnow(),
-        onupdate=lambda: datetime.utcnow(),
+        default=utcnow,
+        onupdate=utcnow,
         nullable=False,
     )
 
@@ -69,22 +110,33 @@ class Check(Base):
 
     __tablename__ = "checks"
 
-    id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=lambda: uuid.uuid4()
-    )
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     target_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("targets.id", ondelete="CASCADE"), nullable=False, index=True
     )
     checked_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.utcnow(), nullable=False, index=True
+        DateTime, default=utcnow, nullable=False, index=True
     )
     up: Mapped[bool] = mapped_column(Boolean, nullable=False)
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    http_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    error_type: Mapped[str] = mapped_column(String(50), nullable=False)
-    error_message: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    http_status: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    error_type: Mapped[ErrorType] = mapped_column(
+        SqlEnum(
+            ErrorType,
+            name="error_type_t",
+            values_callable=lambda obj: [member.value for member in obj],
+        ),
+        nullable=False,
+    )
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     __table_args__ = (
-        Index("ix_checks_target_id_checked_at", "target_id", "checked_at"),
+        CheckConstraint("length(error_message) <= 500", name="ck_checks_error_message_len"),
+        Index(
+            "ix_checks_target_id_checked_at_covering",
+            "target_id",
+            desc("checked_at"),
+            postgresql_include=["up", "latency_ms", "http_status", "error_type", "error_message"],
+        ),
         Index("ix_checks_checked_at", "checked_at"),
     )
@@ -2,20 +2,54 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
 from contextlib import asynccontextmanager
 
+from sqlalchemy import NullPool, insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from nedap_ons_uptime.db.models import Base
+from nedap_ons_uptime.db.models import Base, Check, uuid7
+
+_CHECK_COLUMNS = (
+    "id",
+    "target_id",
+    "checked_at",
+    "up",
+    "latency_ms",
+    "http_status",
+    "error_type",
+    "error_message",
+)
 
 
 class Database:
     """Database wrapper exposing engine and managed sessions."""
 
-    def __init__(self, database_url: str) -> None:
-        """Create an async SQLAlchemy engine and session factory."""
-        self.engine = create_async_engine(database_url, echo=False)
+    def __init__(
+        self,
+        database_url: str,
+        pool_size: int = 20,
+        max_overflow: int = 20,
+        pool_recycle_s: int = 300,
+    ) -> None:
+        """Create an async SQLAlchemy engine and session factory.
+
+        Pool sizing guideline: size the pool at the expected concurrent
+        request count plus the probe-writer burst, with pre-ping and a
+        short recycle so dead TCP connections are replaced before use.
+        SQLite is single-writer, so pooling is disabled there entirely.
+        """
+        if database_url.startswith("sqlite"):
+            self.engine = create_async_engine(database_url, echo=False, poolclass=NullPool)
+        else:
+            self.engine = create_async_engine(
+                database_url,
+                echo=False,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=True,
+                pool_recycle=pool_recycle_s,
+            )
         self.async_session = async_sessionmaker(
             self.engine, expire_on_commit=False, class_=AsyncSession
         )
@@ -25,6 +59,35 @@ class Database:
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+    async def bulk_insert_checks(self, rows: Sequence[dict[str, object]]) -> None:
+        """Insert check rows, switching to COPY for large asyncpg batches.
+
+        COPY bypasses per-row INSERT protocol and statement parsing, which
+        pays off for backfills and very wide ticks; small batches stay on
+        the regular executemany path.
+        """
+        if len(rows) <= 100 or self.engine.dialect.driver != "asyncpg":
+            async with self.session() as session:
+                await session.execute(insert(Check), list(rows))
+            return
+
+        # COPY skips column defaults, so ids must be generated here. Enum
+        # members are unwrapped to their stored values for the text codec.
+        records = [
+            tuple(
+                row.get(column) or uuid7()
+                if column == "id"
+                else getattr(row.get(column), "value", row.get(column))
+                for column in _CHECK_COLUMNS
+            )
+            for row in rows
+        ]
+        async with self.engine.begin() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "checks", records=records, columns=list(_CHECK_COLUMNS)
+            )
+
     async def close(self) -> None:
         """Dispose the underlying SQLAlchemy engine."""
         await self.engine.dispose()
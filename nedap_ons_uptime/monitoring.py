@@ -6,22 +6,154 @@ import asyncio
 import logging
 import ssl
 import time
-import urllib.parse
+from dataclasses import dataclass
 from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
 
 import httpx
-from sqlalchemy import func, select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from nedap_ons_uptime.db.models import Check, ErrorType, Target
+from nedap_ons_uptime.db.models import Check, ErrorType, Target, utcnow
 from nedap_ons_uptime.db.session import get_database
 
 logger = logging.getLogger(__name__)
 
+# Most-derived exception class wins: _classify_error walks the MRO.
+ERROR_MAP: dict[type[BaseException], ErrorType] = {
+    ssl.SSLError: ErrorType.TLS,
+    httpx.TimeoutException: ErrorType.TIMEOUT,
+    httpx.ConnectError: ErrorType.CONNECT,
+    httpx.HTTPError: ErrorType.HTTP,
+}
+
+
+def _classify_error(error: BaseException) -> ErrorType:
+    """Map an exception to an ErrorType via its class hierarchy."""
+    for cls in type(error).__mro__:
+        error_type = ERROR_MAP.get(cls)
+        if error_type is not None:
+            return error_type
+    return ErrorType.UNKNOWN
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of a single probe; unpacks like the tuple it replaced."""
+
+    up: bool
+    latency_ms: int | None
+    http_status: int | None
+    error_type: ErrorType
+    error_message: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class TargetSpec:
+    """Immutable snapshot of the target fields the probe loop needs.
+
+    Probe tasks run outside any session, so handing them plain values
+    instead of detached ORM instances rules out lazy-load surprises.
+    """
+
+    id: UUID
+    url: str
+    timeout_s: int
+    verify_tls: bool
+    interval_s: int
+    method: str = "GET"
+
+
+class Scheduler:
+    """In-memory view of when each target was last checked.
+
+    Keeping this in the worker process means a tick only reads the tiny
+    targets table; the checks table is never aggregated after warm-up.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty cache; call warm() once per process."""
+        self._last_checked: dict[UUID, datetime] = {}
+        self._warmed = False
+
+    async def warm(self, session: AsyncSession) -> None:
+        """Seed the cache from the checks table on first use."""
+        if self._warmed:
+            return
+        # DISTINCT ON walks the (target_id, checked_at DESC) index: one
+        # seek per target instead of aggregating the whole checks table.
+        result = await session.execute(
+            select(Check.target_id, Check.checked_at)
+            .distinct(Check.target_id)
+            .order_by(Check.target_id, Check.checked_at.desc())
+        )
+        self._last_checked.update(dict(result.all()))
+        self._warmed = True
+
+    def mark_checked(self, target_id: UUID, checked_at: datetime) -> None:
+        """Record that a target was just checked."""
+        self._last_checked[target_id] = checked_at
+
+    def forget(self, target_id: UUID) -> None:
+        """Drop scheduling state for a deleted or disabled target."""
+        self._last_checked.pop(target_id, None)
+
+    def is_due(self, target_id: UUID, interval_s: int, now: datetime) -> bool:
+        """Return whether a target needs a new check."""
+        last_checked = self._last_checked.get(target_id)
+        if last_checked is None:
+            return True
+        return (now - last_checked).total_seconds() >= interval_s
+
+    def seconds_until_due(self, target_id: UUID, interval_s: int, now: datetime) -> float:
+        """Return how long until the target's next check is due."""
+        last_checked = self._last_checked.get(target_id)
+        if last_checked is None:
+            return 0.0
+        return max(0.0, interval_s - (now - last_checked).total_seconds())
+
+
+_scheduler = Scheduler()
+
+# One pooled client per TLS-verification mode, shared by every probe so
+# connections, DNS answers and TLS sessions are reused across ticks.
+_clients: dict[bool, httpx.AsyncClient] = {}
+
+
+def _get_client(verify_tls: bool) -> httpx.AsyncClient:
+    """Return the shared pooled client for the given verification mode."""
+    client = _clients.get(verify_tls)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=verify_tls,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        )
+        _clients[verify_tls] = client
+    return client
+
+
+async def close_probe_clients() -> None:
+    """Close the shared probe clients on worker shutdown."""
+    for client in _clients.values():
+        if not client.is_closed:
+            await client.aclose()
+    _clients.clear()
+
+
+def forget_target(target_id: UUID) -> None:
+    """Drop scheduler state for a target that was deleted via the API."""
+    _scheduler.forget(target_id)
+
 
 async def probe_target(
-    url: str, timeout_s: int, verify_tls: bool = True
-) -> tuple[bool, int | None, int | None, str, str | None]:
+    url: str,
+    timeout_s: int,
+    verify_tls: bool = True,
+    client: httpx.AsyncClient | None = None,
+    method: str = "GET",
+) -> ProbeResult:
     """Probe a URL and return availability and diagnostic details."""
     start = time.monotonic()
     error_type = ErrorType.UNKNOWN
@@ -29,100 +161,89 @@ async def probe_target(
     http_status = None
 
     try:
-        parsed = urllib.parse.urlparse(url)
-        host = parsed.hostname
-
-        if not host:
-            raise ValueError("Invalid URL: no hostname")
-
         http_status = None
-        async with httpx.AsyncClient(
-            timeout=timeout_s, verify=verify_tls, follow_redirects=True
-        ) as client:
-            response = await client.get(url)
-            http_status = response.status_code
+        if client is not None:
+            response = await client.request(method, url, timeout=timeout_s)
+            if method == "HEAD" and response.status_code == 405:
+                # Some servers reject HEAD; retry the probe as a plain GET.
+                response = await client.request("GET", url, timeout=timeout_s)
+        else:
+            async with httpx.AsyncClient(
+                timeout=timeout_s, verify=verify_tls, follow_redirects=True
+            ) as one_shot:
+                response = await one_shot.request(method, url)
+                if method == "HEAD" and response.status_code == 405:
+                    response = await one_shot.request("GET", url)
+        http_status = response.status_code
 
         latency_ms = int((time.monotonic() - start) * 1000)
         is_up = response.is_success
         error_type = ErrorType.UNKNOWN if is_up else ErrorType.HTTP
         error_message = None if is_up else f"HTTP {http_status}"
-        return is_up, latency_ms, http_status, error_type, error_message
+        return ProbeResult(is_up, latency_ms, http_status, error_type, error_message)
 
-    except ssl.SSLCertVerificationError as e:
-        error_type = ErrorType.TLS
-        error_message = str(e)[:500]
-    except ssl.SSLError as e:
-        error_type = ErrorType.TLS
-        error_message = str(e)[:500]
-    except httpx.ConnectTimeout as e:
-        error_type = ErrorType.TIMEOUT
-        error_message = str(e)[:500]
-    except httpx.TimeoutException as e:
-        error_type = ErrorType.TIMEOUT
-        error_message = str(e)[:500]
-    except httpx.ConnectError as e:
-        error_type = ErrorType.CONNECT
-        error_message = str(e)[:500]
-    except httpx.HTTPError as e:
-        error_type = ErrorType.HTTP
-        error_message = str(e)[:500]
     except Exception as e:
+        error_type = _classify_error(e)
         error_message = str(e)[:500]
 
     latency_ms = int((time.monotonic() - start) * 1000) if start else None
-    return False, latency_ms, http_status, error_type, error_message
+    return ProbeResult(False, latency_ms, http_status, error_type, error_message)
 
 
-async def check_target(session: AsyncSession, target: Target) -> None:
-    """Run a probe for a target and persist the check result."""
+async def check_target(target: TargetSpec) -> dict[str, object]:
+    """Run a probe for a target and return a Check row for bulk insert."""
     up, latency_ms, http_status, error_type, error_message = await probe_target(
-        target.url, target.timeout_s, verify_tls=target.verify_tls
+        target.url,
+        target.timeout_s,
+        verify_tls=target.verify_tls,
+        client=_get_client(target.verify_tls),
+        method=target.method,
     )
 
-    check = Check(
-        target_id=target.id,
-        checked_at=datetime.utcnow(),
-        up=up,
-        latency_ms=latency_ms,
-        http_status=http_status,
-        error_type=error_type,
-        error_message=error_message,
-    )
-    session.add(check)
+    checked_at = utcnow()
+    _scheduler.mark_checked(target.id, checked_at)
+    return {
+        "target_id": target.id,
+        "checked_at": checked_at,
+        "up": up,
+        "latency_ms": latency_ms,
+        "http_status": http_status,
+        "error_type": error_type,
+        "error_message": error_message,
+    }
 
 
 async def load_targets(session: AsyncSession) -> list[Target]:
     """Load all enabled targets."""
-    result = await session.execute(select(Target).where(Target.enabled.is_(True)))
+    # lambda_stmt caches the compiled SQL across calls.
+    stmt = lambda_stmt(lambda: select(Target).where(Target.enabled.is_(True)))
+    result = await session.execute(stmt)
     return list(result.scalars().all())
 
 
-async def load_due_targets(session: AsyncSession) -> list[Target]:
-    """Load enabled targets due for a new check."""
-    now = datetime.utcnow()
-    subq = (
-        select(Check.target_id, func.max(Check.checked_at).label("last_checked"))
-        .group_by(Check.target_id)
-        .subquery()
+async def load_target_specs(session: AsyncSession) -> list[TargetSpec]:
+    """Load probe specs for all enabled targets without ORM hydration."""
+    stmt = lambda_stmt(
+        lambda: select(
+            Target.id,
+            Target.url,
+            Target.timeout_s,
+            Target.verify_tls,
+            Target.interval_s,
+            Target.method,
+        ).where(Target.enabled.is_(True))
     )
-    result = await session.execute(
-        select(Target, subq.c.last_checked)
-        .outerjoin(subq, Target.id == subq.c.target_id)
-        .where(Target.enabled.is_(True))
-    )
-    rows = result.all()
+    result = await session.execute(stmt)
+    return [TargetSpec(*row) for row in result]
 
-    due_targets: list[Target] = []
-    for target, last_checked in rows:
-        if last_checked is None:
-            due_targets.append(target)
-            continue
 
-        elapsed_s = (now - last_checked).total_seconds()
-        if elapsed_s >= target.interval_s:
-            due_targets.append(target)
+async def load_due_targets(session: AsyncSession) -> list[TargetSpec]:
+    """Load enabled targets due for a new check."""
+    await _scheduler.warm(session)
 
-    return due_targets
+    now = utcnow()
+    specs = await load_target_specs(session)
+    return [spec for spec in specs if _scheduler.is_due(spec.id, spec.interval_s, now)]
 
 
 async def run_checks(concurrency: int = 20) -> None:
@@ -135,21 +256,126 @@ async def run_checks(concurrency: int = 20) -> None:
         return
 
     semaphore = asyncio.Semaphore(concurrency)
+    rows: list[dict[str, object]] = []
+
+    async def check_and_release(target: TargetSpec) -> None:
+        try:
+            rows.append(await check_target(target))
+        except Exception:
+            logger.exception("Failed to check target", extra={"target_id": str(target.id)})
+        finally:
+            semaphore.release()
 
-    async def check_with_semaphore(target: Target) -> None:
+    # Submit lazily behind the semaphore: at most `concurrency` coroutines
+    # exist at a time instead of one per target up front.
+    async with asyncio.TaskGroup() as tg:
+        for target in targets:
+            await semaphore.acquire()
+            tg.create_task(check_and_release(target))
+
+    if not rows:
+        return
+
+    # One write for the whole tick: network RTT and WAL fsync are paid
+    # once per cycle, and wide ticks go through COPY.
+    await db.bulk_insert_checks(rows)
+
+
+async def _target_loop(
+    spec: TargetSpec,
+    semaphore: asyncio.Semaphore,
+    queue: asyncio.Queue[dict[str, object]],
+) -> None:
+    """Probe a single target on its own interval, forever."""
+    delay = _scheduler.seconds_until_due(spec.id, spec.interval_s, utcnow())
+    if delay:
+        await asyncio.sleep(delay)
+
+    while True:
         async with semaphore:
-            db = get_database()
-            async with db.session() as session:
-                try:
-                    await check_target(session, target)
-                except Exception:
-                    logger.exception("Failed to check target", extra={"target_id": str(target.id)})
+            try:
+                row = await check_target(spec)
+            except Exception:
+                logger.exception("Failed to check target", extra={"target_id": str(spec.id)})
+                row = None
 
-    await asyncio.gather(*[check_with_semaphore(t) for t in targets])
+        if row is not None:
+            await queue.put(row)
 
+        await asyncio.sleep(spec.interval_s)
 
-async def worker_loop(interval_s: int = 60, concurrency: int = 20) -> None:
-    """Continuously run monitoring cycles with a fixed interval."""
+
+async def _drain_queue(
+    queue: asyncio.Queue[dict[str, object]],
+    max_rows: int = 100,
+    timeout_s: float = 0.5,
+) -> list[dict[str, object]]:
+    """Collect up to max_rows from the queue, waiting at most timeout_s."""
+    rows = [await queue.get()]
+    deadline = time.monotonic() + timeout_s
+    while len(rows) < max_rows:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            rows.append(await asyncio.wait_for(queue.get(), remaining))
+        except TimeoutError:
+            break
+    return rows
+
+
+async def _writer_loop(queue: asyncio.Queue[dict[str, object]]) -> None:
+    """Drain probe results onto one connection in batched inserts.
+
+    Serializing writes here keeps the pool free for API reads and
+    decouples probe latency from database write latency.
+    """
+    db = get_database()
     while True:
-        await run_checks(concurrency)
-        await asyncio.sleep(interval_s)
+        rows = await _drain_queue(queue)
+        try:
+            await db.bulk_insert_checks(rows)
+        except Exception:
+            logger.exception("Failed to store check batch", extra={"rows": len(rows)})
+
+
+async def worker_loop(interval_s: int = 60, concurrency: int = 20) -> None:
+    """Run one probe loop per enabled target, reconciling every interval_s.
+
+    Each target sleeps exactly its own interval_s, so slow targets stop
+    being rescanned every tick and fast targets are no longer capped by
+    the global cadence. The reconcile pass picks up created, changed and
+    deleted targets.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    queue: asyncio.Queue[dict[str, object]] = asyncio.Queue()
+    writer = asyncio.create_task(_writer_loop(queue))
+    tasks: dict[UUID, asyncio.Task[None]] = {}
+    specs: dict[UUID, TargetSpec] = {}
+    db = get_database()
+    try:
+        while True:
+            async with db.session() as session:
+                await _scheduler.warm(session)
+                current = {spec.id: spec for spec in await load_target_specs(session)}
+
+            for target_id in list(tasks):
+                if target_id not in current:
+                    tasks.pop(target_id).cancel()
+                    specs.pop(target_id, None)
+                    _scheduler.forget(target_id)
+
+            for target_id, spec in current.items():
+                if specs.get(target_id) != spec:
+                    stale = tasks.pop(target_id, None)
+                    if stale is not None:
+                        stale.cancel()
+                    specs[target_id] = spec
+                    tasks[target_id] = asyncio.create_task(_target_loop(spec, semaphore, queue))
+
+            await asyncio.sleep(interval_s)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        writer.cancel()
+        await close_probe_clients()
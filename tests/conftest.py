@@ -0,0 +1,22 @@
+"""Shared fixtures for the test suite."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+
+@pytest.fixture(scope="session")
+def mock_transport() -> httpx.MockTransport:
+    """Return a transport answering /status/{code} with that status code."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(int(request.url.path.rsplit("/", 1)[-1]))
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture(scope="session")
+def probe_client(mock_transport: httpx.MockTransport) -> httpx.AsyncClient:
+    """Return a shared async client backed by the mock transport."""
+    return httpx.AsyncClient(transport=mock_transport, follow_redirects=True)
@@ -1,5 +1,7 @@
 """Test the api schemas."""
 
+from __future__ import annotations
+
 from datetime import UTC, datetime
 from uuid import uuid4
 
@@ -0,0 +1,36 @@
+"""Test the cache module."""
+
+from __future__ import annotations
+
+import pytest
+
+from nedap_ons_uptime import cache as cache_module
+from nedap_ons_uptime.cache import TTLCache
+
+
+def test_ttl_cache_returns_value_before_expiry() -> None:
+    """Cached values should be returned while the TTL has not elapsed."""
+    cache = TTLCache(ttl_s=60)
+    cache.set("key", [1, 2, 3])
+
+    assert cache.get("key") == [1, 2, 3]
+
+
+def test_ttl_cache_expires_value_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Cached values should expire once the TTL has elapsed."""
+    cache = TTLCache(ttl_s=5)
+    cache.set("key", "value")
+
+    now = cache_module.time.monotonic()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now + 10)
+
+    assert cache.get("key") is None
+
+
+def test_ttl_cache_clear_drops_entries() -> None:
+    """Clear should remove all cached entries."""
+    cache = TTLCache(ttl_s=60)
+    cache.set("key", "value")
+    cache.clear()
+
+    assert cache.get("key") is None
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from types import SimpleNamespace
 
 import pytest
@@ -17,11 +18,10 @@ class _DummyServer:
         return None
 
 
-def test_serve_preserves_environment_for_migrations(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Serve should pass existing env vars to migration subprocess."""
-    captured: dict[str, object] = {}
+def test_serve_runs_migrations_in_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Serve should apply migrations in-process before starting the server."""
+    migrated: list[str] = []
 
-    monkeypatch.setenv("TEST_SENTINEL", "present")
     monkeypatch.setattr(
         cli,
         "get_settings",
@@ -34,43 +34,44 @@ def test_serve_preserves_environment_for_migrations(monkeypatch: pytest.MonkeyPa
     monkeypatch.setattr(cli, "create_app", lambda: object())
     monkeypatch.setattr(cli, "Config", lambda **kwargs: kwargs)
     monkeypatch.setattr(cli, "Server", _DummyServer)
-
-    def _fake_run(cmd: list[str], env: dict[str, str] | None = None) -> SimpleNamespace:
-        captured["cmd"] = cmd
-        captured["env"] = env
-        return SimpleNamespace(returncode=0)
-
-    monkeypatch.setattr("subprocess.run", _fake_run)
+    monkeypatch.setattr(cli, "run_migrations", migrated.append)
 
     cli.serve()
 
-    env = captured["env"]
-    assert isinstance(env, dict)
-    assert env["TEST_SENTINEL"] == "present"
-    assert env["DATABASE_URL"] == "postgresql+asyncpg://u:p@localhost:5432/db"
+    assert migrated == ["postgresql+asyncpg://u:p@localhost:5432/db"]
 
 
-def test_migrate_preserves_environment_for_migrations(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Migrate should pass existing env vars to migration subprocess."""
+def test_run_migrations_exports_database_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    """run_migrations should export DATABASE_URL for the Alembic env."""
     captured: dict[str, object] = {}
 
-    monkeypatch.setenv("TEST_SENTINEL", "present")
+    def _fake_upgrade(config: object, revision: str) -> None:
+        captured["revision"] = revision
+        captured["database_url"] = os.environ.get("DATABASE_URL")
+
+    monkeypatch.setattr("alembic.command.upgrade", _fake_upgrade)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+
+    cli.run_migrations("postgresql+asyncpg://u:p@localhost:5432/db")
+
+    assert captured["revision"] == "head"
+    assert captured["database_url"] == "postgresql+asyncpg://u:p@localhost:5432/db"
+
+
+def test_migrate_exits_nonzero_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Migrate should exit with code 1 when migrations fail."""
     monkeypatch.setattr(
         cli,
         "get_settings",
         lambda: SimpleNamespace(database_url="postgresql+asyncpg://u:p@localhost:5432/db"),
     )
 
-    def _fake_run(cmd: list[str], env: dict[str, str] | None = None) -> SimpleNamespace:
-        captured["cmd"] = cmd
-        captured["env"] = env
-        return SimpleNamespace(returncode=0)
+    def _boom(_url: str) -> None:
+        raise RuntimeError("migration failed")
 
-    monkeypatch.setattr("subprocess.run", _fake_run)
+    monkeypatch.setattr(cli, "run_migrations", _boom)
 
-    cli.migrate()
+    with pytest.raises(cli.typer.Exit) as error:
+        cli.migrate()
 
-    env = captured["env"]
-    assert isinstance(env, dict)
-    assert env["TEST_SENTINEL"] == "present"
-    assert env["DATABASE_URL"] == "postgresql+asyncpg://u:p@localhost:5432/db"
+    assert error.value.exit_code == 1
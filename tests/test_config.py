@@ -1,5 +1,7 @@
 """Test the configuration module."""
 
+from __future__ import annotations
+
 import pytest
 
 from nedap_ons_uptime.config import get_settings
@@ -0,0 +1,23 @@
+"""Test the alembic migration scripts."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_migration_revisions_are_unique() -> None:
+    """Every migration file should carry a distinct revision id."""
+    config = Config(str(REPO_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(REPO_ROOT / "alembic"))
+    script = ScriptDirectory.from_config(config)
+
+    revisions = [revision.revision for revision in script.walk_revisions()]
+    version_files = list((REPO_ROOT / "alembic" / "versions").glob("*.py"))
+
+    assert len(set(revisions)) == len(revisions)
+    assert len(revisions) == len(version_files)
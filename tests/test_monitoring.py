@@ -2,72 +2,95 @@
 
 from __future__ import annotations
 
-from types import TracebackType
+import asyncio
+from datetime import timedelta
+from unittest import mock
+from uuid import uuid4
 
+import httpx
 import pytest
 
-from nedap_ons_uptime.db.models import ErrorType
-from nedap_ons_uptime.monitoring import probe_target
+from nedap_ons_uptime.db.models import ErrorType, utcnow
+from nedap_ons_uptime.monitoring import ProbeResult, Scheduler, _drain_queue, probe_target
 
 
-class _DummyResponse:
-    def __init__(self, status_code: int) -> None:
-        self.status_code = status_code
-        self.is_success = 200 <= status_code < 300
+@pytest.mark.parametrize(
+    ("status", "up", "error_type", "error_message"),
+    [
+        (500, False, ErrorType.HTTP, "HTTP 500"),
+        (204, True, ErrorType.UNKNOWN, None),
+    ],
+)
+async def test_probe_target_maps_status_to_outcome(
+    probe_client: httpx.AsyncClient,
+    status: int,
+    up: bool,
+    error_type: ErrorType,
+    error_message: str | None,
+) -> None:
+    """probe_target should mark 2xx as up and other statuses as down."""
+    result = await probe_target(f"https://test/status/{status}", timeout_s=5, client=probe_client)
 
+    assert result == ProbeResult(up, mock.ANY, status, error_type, error_message)
 
-class _DummyClient:
-    def __init__(self, status_code: int) -> None:
-        self._status_code = status_code
 
-    async def __aenter__(self) -> _DummyClient:
-        return self
+def test_scheduler_is_due_for_new_and_elapsed_targets() -> None:
+    """Targets are due when never checked or once their interval elapsed."""
+    scheduler = Scheduler()
+    target_id = uuid4()
+    now = utcnow()
 
-    async def __aexit__(
-        self,
-        exc_type: type[BaseException] | None,
-        exc: BaseException | None,
-        tb: TracebackType | None,
-    ) -> bool:
-        return False
+    assert scheduler.is_due(target_id, 60, now) is True
 
-    async def get(self, _url: str) -> _DummyResponse:
-        return _DummyResponse(self._status_code)
+    scheduler.mark_checked(target_id, now - timedelta(seconds=30))
 
+    assert scheduler.is_due(target_id, 60, now) is False
+    assert scheduler.is_due(target_id, 30, now) is True
 
-@pytest.mark.asyncio
-async def test_probe_target_marks_http_error_as_down(monkeypatch: pytest.MonkeyPatch) -> None:
-    """probe_target should mark non-2xx responses as down."""
-    monkeypatch.setattr(
-        "nedap_ons_uptime.monitoring.httpx.AsyncClient",
-        lambda **_kwargs: _DummyClient(500),
-    )
 
-    up, latency_ms, http_status, error_type, error_message = await probe_target(
-        "https://example.com", timeout_s=5
-    )
+def test_scheduler_seconds_until_due_counts_down_and_floors_at_zero() -> None:
+    """seconds_until_due measures from the last check and never goes negative."""
+    scheduler = Scheduler()
+    target_id = uuid4()
+    now = utcnow()
 
-    assert up is False
-    assert latency_ms is not None
-    assert http_status == 500
-    assert error_type == ErrorType.HTTP
-    assert error_message == "HTTP 500"
+    assert scheduler.seconds_until_due(target_id, 60, now) == 0.0
 
+    scheduler.mark_checked(target_id, now - timedelta(seconds=20))
 
-@pytest.mark.asyncio
-async def test_probe_target_marks_2xx_as_up(monkeypatch: pytest.MonkeyPatch) -> None:
-    """probe_target should mark 2xx responses as up."""
-    monkeypatch.setattr(
-        "nedap_ons_uptime.monitoring.httpx.AsyncClient",
-        lambda **_kwargs: _DummyClient(204),
-    )
+    assert scheduler.seconds_until_due(target_id, 60, now) == pytest.approx(40.0)
+    assert scheduler.seconds_until_due(target_id, 10, now) == 0.0
 
-    up, latency_ms, http_status, error_type, error_message = await probe_target(
-        "https://example.com", timeout_s=5
-    )
 
-    assert up is True
-    assert latency_ms is not None
-    assert http_status == 204
-    assert error_type == ErrorType.UNKNOWN
-    assert error_message is None
+def test_scheduler_forget_makes_target_due_again() -> None:
+    """Forgetting a target drops its state so it probes immediately."""
+    scheduler = Scheduler()
+    target_id = uuid4()
+    now = utcnow()
+
+    scheduler.mark_checked(target_id, now)
+    scheduler.forget(target_id)
+
+    assert scheduler.is_due(target_id, 3600, now) is True
+
+
+async def test_drain_queue_stops_at_max_rows() -> None:
+    """_drain_queue returns at most max_rows even when more are queued."""
+    queue: asyncio.Queue[dict[str, object]] = asyncio.Queue()
+    for i in range(5):
+        queue.put_nowait({"i": i})
+
+    rows = await _drain_queue(queue, max_rows=3, timeout_s=0.01)
+
+    assert [row["i"] for row in rows] == [0, 1, 2]
+    assert queue.qsize() == 2
+
+
+async def test_drain_queue_returns_partial_batch_on_timeout() -> None:
+    """_drain_queue gives up waiting for a full batch once the timeout elapses."""
+    queue: asyncio.Queue[dict[str, object]] = asyncio.Queue()
+    queue.put_nowait({"i": 0})
+
+    rows = await _drain_queue(queue, max_rows=10, timeout_s=0.01)
+
+    assert len(rows) == 1